@@ -1,59 +1,147 @@
 from __future__ import annotations
 
 import argparse
+import functools
+import hashlib
 import json
 import sys
 from pathlib import Path
 
-from colorama import init as colorama_init
+# orjson (SIMD) é bem mais rápido que o json da stdlib; opcional, com fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-from app.core.config import get_settings
 from app.core.logging import setup_logging
-from app.core.summarizer import summarize_transcript
-from app.core.transcriber import save_transcript, transcribe_file
 from app.models.transcript import Transcript
 
-# Inicializa colorama para Windows e TTYs
-colorama_init(autoreset=True)
+# Os imports pesados (OpenAI SDK via transcriber/summarizer, colorama, settings)
+# são feitos sob demanda dentro dos comandos: `--help`/`--version` não pagam o
+# custo de import transitiva do SDK no cold start.
+
+
+def _ensure_color() -> None:
+    """Inicializa o colorama sob demanda (Windows e TTYs)."""
+    if not sys.stdout.isatty():
+        return
+    from colorama import init as colorama_init  # noqa: PLC0415
+
+    colorama_init(autoreset=True)
 
 
 def _print_header() -> None:
-    pass
+    _ensure_color()
+
+
+def _json_loads(data: bytes) -> dict:
+    """Faz parse de JSON em bytes, preferindo orjson quando disponível."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps_bytes(obj: object) -> bytes:
+    """Serializa para JSON indentado em bytes, preferindo orjson quando disponível."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+# Cache em disco das transcrições de áudio (chaveado por SHA-256 do conteúdo)
+_TRANSCRIPT_CACHE_DIR = Path.home() / ".cache" / "clareia" / "transcripts"
+_HASH_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
+# Limite do preview de transcrição no stdout
+PREVIEW_LIMIT = 4000
+
+# Extensões de áudio aceitas para transcrição implícita no summarize
+_AUDIO_EXTS = {".mp3", ".wav", ".m4a"}
+
+
+def _hash_file(path_obj: Path) -> str:
+    """Calcula o SHA-256 do arquivo em streaming (blocos de 1 MiB)."""
+    digest = hashlib.sha256()
+    with path_obj.open("rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _transcribe_with_cache(path: str, *, use_cache: bool = True, **kwargs: object) -> Transcript:
+    """Transcreve o áudio, reaproveitando resultados anteriores via cache em disco.
+
+    O cache é chaveado pelo hash do conteúdo do arquivo mais as opções de
+    transcrição: renomear ou mover o áudio não invalida o resultado, mas mudar
+    os bytes, o modelo, o idioma ou o formato dispara uma nova chamada à API.
+    """
+    from app.core.transcriber import transcribe_file  # noqa: PLC0415
+
+    if not use_cache:
+        return transcribe_file(path, **kwargs)
+
+    options = json.dumps({k: str(v) for k, v in sorted(kwargs.items()) if v is not None}, sort_keys=True)
+    options_digest = hashlib.sha256(options.encode()).hexdigest()[:16]
+    cache_path = _TRANSCRIPT_CACHE_DIR / f"{_hash_file(Path(path))}_{options_digest}.json"
+    if cache_path.exists():
+        return Transcript.model_validate_json(cache_path.read_text(encoding="utf-8"))
+
+    transcript = transcribe_file(path, **kwargs)
+
+    # Escrita atômica: grava em arquivo temporário e renomeia por cima
+    _TRANSCRIPT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(".json.tmp")
+    tmp_path.write_text(transcript.model_dump_json(), encoding="utf-8")
+    tmp_path.replace(cache_path)
+
+    return transcript
 
 
 def cmd_transcribe(args: argparse.Namespace) -> int:
+    from app.core.config import get_settings  # noqa: PLC0415
+    from app.core.transcriber import save_transcript  # noqa: PLC0415
+
     settings = get_settings()
     model = args.model or settings.default_transcribe_model
     language = args.language or settings.default_language
     response_format = args.format or settings.default_response_format
 
-    transcript = transcribe_file(
+    transcript = _transcribe_with_cache(
         args.input,
+        use_cache=not args.no_cache,
         model=model,
         language=language,
         response_format=response_format,
         prompt=args.prompt,
     )
 
-    if args.output:
+    if args.output == "-":
+        # JSON direto no stdout, para encadear com `summarize -`
+        sys.stdout.buffer.write(_json_dumps_bytes(transcript.model_dump()))
+        sys.stdout.buffer.write(b"\n")
+    elif args.output:
         out_fmt = "json" if args.save_json else "txt"
         save_transcript(transcript, args.output, as_format=out_fmt)
     else:
-        pass
+        # Preview limitado: o modelo só materializa o necessário, mesmo quando
+        # o texto completo teria vários MB em reuniões longas
+        text, truncated = transcript.preview(PREVIEW_LIMIT)
+        sys.stdout.write(text)
+        if truncated:
+            sys.stdout.write("...")
+        sys.stdout.write("\n")
 
     return 0
 
 
-def _load_transcript_from_path(path: str) -> Transcript:
+@functools.lru_cache(maxsize=32)
+def _load_transcript_from_path_cached(path: str, _mtime_ns: int, _size: int) -> Transcript:
+    """Carrega o transcript do disco; cacheado por (path, mtime, size) em memória."""
     path_obj = Path(path)
-    if not path_obj.exists():
-        raise FileNotFoundError(path)
-
     ext = path_obj.suffix.lower()
 
     if ext in {".json"}:
-        with path_obj.open(encoding="utf-8") as f:
-            data = json.load(f)
+        data = _json_loads(path_obj.read_bytes())
         return Transcript.model_validate(data)
 
     if ext in {".txt"}:
@@ -61,15 +149,56 @@ def _load_transcript_from_path(path: str) -> Transcript:
             text = f.read()
         return Transcript(text=text, language="pt", segments=None, source_path=path)
 
-    # Se for áudio (.mp3/.wav/.m4a), vamos transcrever primeiro
-    return transcribe_file(path)
+    # Se for áudio (.mp3/.wav/.m4a), vamos transcrever primeiro; extensão
+    # desconhecida falha cedo em vez de disparar uma transcrição silenciosa
+    if ext not in _AUDIO_EXTS:
+        msg = f"Extensão não suportada para summarize: {ext} ({path}). Use .json, .txt, .mp3, .wav ou .m4a."
+        raise ValueError(msg)
+    return _transcribe_with_cache(path)
+
+
+def _load_transcript_from_stdin() -> Transcript:
+    """Lê um transcript do stdin: JSON quando possível, texto puro caso contrário."""
+    data = sys.stdin.buffer.read()
+    try:
+        return Transcript.model_validate(_json_loads(data))
+    except ValueError:
+        return Transcript(text=data.decode("utf-8"), language="pt", segments=None, source_path=None)
+
+
+def _load_transcript_from_path(path: str, *, use_cache: bool = True) -> Transcript:
+    # `-` lê do stdin e evita o roundtrip por arquivo em pipelines
+    if path == "-":
+        return _load_transcript_from_stdin()
+
+    path_obj = Path(path)
+    if not path_obj.exists():
+        raise FileNotFoundError(path)
+
+    if not use_cache:
+        ext = path_obj.suffix.lower()
+        if ext in {".json", ".txt"}:
+            return _load_transcript_from_path_cached.__wrapped__(path, 0, 0)
+        # Mesmo guard do caminho cacheado: extensão desconhecida falha cedo
+        # em vez de disparar uma transcrição silenciosa
+        if ext not in _AUDIO_EXTS:
+            msg = f"Extensão não suportada para summarize: {ext} ({path}). Use .json, .txt, .mp3, .wav ou .m4a."
+            raise ValueError(msg)
+        return _transcribe_with_cache(path, use_cache=False)
+
+    # mtime e tamanho fazem parte da chave: editar o arquivo invalida o cache
+    stat = path_obj.stat()
+    return _load_transcript_from_path_cached(path, stat.st_mtime_ns, stat.st_size)
 
 
 def cmd_summarize(args: argparse.Namespace) -> int:
+    from app.core.config import get_settings  # noqa: PLC0415
+    from app.core.summarizer import summarize_transcript  # noqa: PLC0415
+
     settings = get_settings()
 
     # Se input for áudio, transcreve antes
-    transcript = _load_transcript_from_path(args.input)
+    transcript = _load_transcript_from_path(args.input, use_cache=not args.no_cache)
 
     summary = summarize_transcript(
         transcript,
@@ -78,33 +207,47 @@ def cmd_summarize(args: argparse.Namespace) -> int:
         extra_context=args.context,
     )
 
-    if args.output:
+    if args.output == "-":
+        sys.stdout.buffer.write(_json_dumps_bytes(summary.model_dump()))
+        sys.stdout.buffer.write(b"\n")
+    elif args.output:
         output_path = Path(args.output).resolve()
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with output_path.open("w", encoding="utf-8") as f:
-            json.dump(summary.model_dump(), f, ensure_ascii=False, indent=2)
+        output_path.write_bytes(_json_dumps_bytes(summary.model_dump()))
     else:
         pass
 
     return 0
 
 
-def build_parser() -> argparse.ArgumentParser:
+# Texto de ajuda do parser raiz (constante: não é reconstruído a cada chamada)
+_DESCRIPTION = (
+    "Ferramenta para transcrever áudios e gerar ata/insights com OpenAI.\n\n"
+    "Compatibilidade de formatos:\n"
+    "- gpt-4o-transcribe: suporta apenas response_format = json ou text\n"
+    "- whisper-1: suporta json, text, verbose_json, srt, vtt"
+)
+
+
+def _build_root_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="app",
-        description=(
-            "Ferramenta para transcrever áudios e gerar ata/insights com OpenAI.\n\n"
-            "Compatibilidade de formatos:\n"
-            "- gpt-4o-transcribe: suporta apenas response_format = json ou text\n"
-            "- whisper-1: suporta json, text, verbose_json, srt, vtt"
-        ),
+        description=_DESCRIPTION,
         formatter_class=argparse.RawTextHelpFormatter,
     )
     parser.add_argument("--verbose", action="store_true", help="Ativa logs em nível DEBUG")
+    parser.add_argument("-V", "--version", action="version", version=f"%(prog)s {_version()}")
+    return parser
 
-    sub = parser.add_subparsers(dest="command", required=True)
 
+def _version() -> str:
+    from app import __version__  # noqa: PLC0415
+
+    return __version__
+
+
+def _attach_transcribe(sub: argparse._SubParsersAction) -> None:
     p_tr = sub.add_parser("transcribe", help="Transcreve um arquivo de áudio (mp3/wav/m4a)")
     p_tr.add_argument("input", help="Caminho para o arquivo .mp3, .wav ou .m4a")
     p_tr.add_argument(
@@ -134,15 +277,22 @@ def build_parser() -> argparse.ArgumentParser:
         "-o",
         "--output",
         default=None,
-        help="Arquivo para salvar a transcrição (json ou txt)",
+        help="Arquivo para salvar a transcrição (json ou txt), ou '-' para JSON no stdout",
     )
     p_tr.add_argument(
         "--save-json",
         action="store_true",
         help="Força salvar a transcrição como JSON (default é txt se format=text)",
     )
+    p_tr.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignora o cache local de transcrições e chama a API novamente",
+    )
     p_tr.set_defaults(func=cmd_transcribe)
 
+
+def _attach_summarize(sub: argparse._SubParsersAction) -> None:
     p_sm = sub.add_parser(
         "summarize",
         help=(
@@ -152,7 +302,7 @@ def build_parser() -> argparse.ArgumentParser:
     )
     p_sm.add_argument(
         "input",
-        help="Caminho do transcript (.json/.txt) ou do arquivo de áudio (.mp3/.wav/.m4a)",
+        help="Caminho do transcript (.json/.txt), do áudio (.mp3/.wav/.m4a) ou '-' para ler do stdin",
     )
     p_sm.add_argument("-m", "--model", default=None, help="Modelo para resumo (ex: gpt-4o-mini)")
     p_sm.add_argument(
@@ -174,13 +324,43 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Arquivo de saída (.json) para a ata/insights",
     )
+    p_sm.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignora os caches locais (transcrição e leitura do transcript)",
+    )
     p_sm.set_defaults(func=cmd_summarize)
 
+
+_SUBCOMMAND_ATTACH = {"transcribe": _attach_transcribe, "summarize": _attach_summarize}
+
+
+def build_parser(only: str | None = None) -> argparse.ArgumentParser:
+    """Monta o parser; com `only`, anexa apenas o subparser do comando pedido."""
+    parser = _build_root_parser()
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    attach = _SUBCOMMAND_ATTACH.get(only) if only else None
+    if attach is not None:
+        attach(sub)
+    else:
+        for attach_fn in _SUBCOMMAND_ATTACH.values():
+            attach_fn(sub)
+
     return parser
 
 
 def main(argv: list[str] | None = None) -> int:
-    parser = build_parser()
+    argv = sys.argv[1:] if argv is None else argv
+
+    # Fast path: responde --version sem montar a árvore completa do argparse
+    if argv and argv[0] in {"-V", "--version"}:
+        sys.stdout.write(f"app {_version()}\n")
+        return 0
+
+    # Com o comando inequívoco, só o subparser correspondente é construído
+    command = next((a for a in argv if not a.startswith("-")), None)
+    parser = build_parser(only=command)
     args = parser.parse_args(argv)
 
     setup_logging(verbose=args.verbose)
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Literal
 
-from pydantic import BaseModel, Field
-
-# Carrega automaticamente .env e .env.local
+# Carrega .env e .env.local sob demanda (em get_settings), não no import
 try:
     from dotenv import find_dotenv, load_dotenv
 except Exception:
@@ -29,43 +29,65 @@ def _load_env_files() -> None:
         load_dotenv(env_local_path, override=True)
 
 
-# Executa no import do módulo (antes de consultar os valores)
-_load_env_files()
+def _as_float(value: str | None, default: float) -> float:
+    try:
+        return float(value) if value else default
+    except ValueError:
+        return default
 
 
-class Settings(BaseModel):
-    """Configurações da aplicação, carregadas via variáveis de ambiente ou .env."""
+def _as_int(value: str | None, default: int) -> int:
+    try:
+        return int(value) if value else default
+    except ValueError:
+        return default
 
-    # OpenAI
-    openai_api_key: str = Field(default_factory=lambda: os.getenv("OPENAI_API_KEY", ""))
-    openai_timeout: float = Field(default_factory=lambda: float(os.getenv("OPENAI_TIMEOUT", "120")))
-    openai_max_retries: int = Field(default_factory=lambda: int(os.getenv("OPENAI_MAX_RETRIES", "3")))
 
-    # Transcrição
-    default_transcribe_model: str = os.getenv("TRANSCRIBE_MODEL", "gpt-4o-transcribe")
-    default_language: str = os.getenv("TRANSCRIBE_LANGUAGE", "pt")
-    default_response_format: Literal["text", "json", "verbose_json", "srt", "vtt"] = os.getenv(
-        "TRANSCRIBE_FORMAT", "json"
-    )  # type: ignore[assignment]
+@dataclass(slots=True, frozen=True)
+class Settings:
+    """Configurações da aplicação, carregadas via variáveis de ambiente ou .env.
 
-    # Summarizer
-    summary_model: str = os.getenv("SUMMARY_MODEL", "gpt-4o-mini")
-    summary_temperature: float = Field(default_factory=lambda: float(os.getenv("SUMMARY_TEMPERATURE", "0.2")))
+    Dataclass com slots em vez de um modelo Pydantic: são oito campos escalares
+    lidos uma vez no startup, sem necessidade de validação de schema — e o
+    import fica fora do caminho quente.
+    """
 
+    # OpenAI
+    openai_api_key: str
+    openai_timeout: float
+    openai_max_retries: int
 
-class SettingsManager:
-    """Gerenciador de configurações singleton."""
+    # Transcrição
+    default_transcribe_model: str
+    default_language: str
+    default_response_format: Literal["text", "json", "verbose_json", "srt", "vtt"]
 
-    _instance: Settings | None = None
+    # Summarizer
+    summary_model: str
+    summary_temperature: float
 
     @classmethod
-    def get_instance(cls) -> Settings:
-        """Retorna a instância singleton de Settings."""
-        if cls._instance is None:
-            cls._instance = Settings()
-        return cls._instance
-
-
+    def from_env(cls) -> Settings:
+        """Monta as configurações a partir das variáveis de ambiente."""
+        # Uma única referência ao mapping em vez de oito os.getenv (cada um
+        # refaz lookup de atributo + __getitem__ do os.environ)
+        env = os.environ
+        return cls(
+            openai_api_key=env.get("OPENAI_API_KEY", ""),
+            openai_timeout=_as_float(env.get("OPENAI_TIMEOUT"), 120.0),
+            openai_max_retries=_as_int(env.get("OPENAI_MAX_RETRIES"), 3),
+            default_transcribe_model=env.get("TRANSCRIBE_MODEL", "gpt-4o-transcribe"),
+            default_language=env.get("TRANSCRIBE_LANGUAGE", "pt"),
+            default_response_format=env.get("TRANSCRIBE_FORMAT", "json"),  # type: ignore[arg-type]
+            summary_model=env.get("SUMMARY_MODEL", "gpt-4o-mini"),
+            summary_temperature=_as_float(env.get("SUMMARY_TEMPERATURE"), 0.2),
+        )
+
+
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Retorna as configurações da aplicação."""
-    return SettingsManager.get_instance()
+    """Retorna as configurações da aplicação (instância única, cacheada)."""
+    # O walk de diretórios do find_dotenv roda no máximo uma vez, e só quando
+    # alguém de fato consulta as configurações
+    _load_env_files()
+    return Settings.from_env()
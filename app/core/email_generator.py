@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import json
+import logging
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from app.models.summary import ActionItem, MeetingSummary
+
+# orjson (SIMD) é bem mais rápido que o json da stdlib; opcional, com fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from app.core.config import get_settings
+from app.core.summarizer import _extract_json_from_content
+from app.models.email import EmailFollowUp
+from app.services.openai_client import get_openai_client
+
+logger = logging.getLogger(__name__)
+
+# Instruções do sistema (constante de módulo: não é re-materializada por chamada)
+_SYSTEM_PROMPT = """Você é um assistente que redige e-mails corporativos de follow-up.
+Dada a ata de uma reunião em português do Brasil, escreva um e-mail claro e cordial
+resumindo o que foi discutido e os próximos passos.
+
+Retorne um JSON válido com a seguinte estrutura:
+{
+    "subject": "Assunto do e-mail",
+    "greeting": "Saudação inicial (ex: Olá, time)",
+    "body": "Corpo principal do e-mail em português",
+    "action_items": ["Lista de próximos passos, com responsável e prazo quando houver"],
+    "closing": "Encerramento (ex: Atenciosamente,)"
+}
+
+Seja objetivo, use português natural e destaque decisões e tarefas.
+Retorne APENAS o JSON, sem explicações adicionais."""
+
+
+def _fmt_action(item: ActionItem) -> str:
+    """Formata um item de ação com responsável e prazo quando houver."""
+    parts = [item.description]
+    if item.owner:
+        parts.append(f" (responsável: {item.owner})")
+    if item.due_date:
+        parts.append(f" (prazo: {item.due_date})")
+    return "".join(parts)
+
+
+def _create_fallback_email(summary: MeetingSummary, formatted_actions: list[str] | None = None) -> EmailFollowUp:
+    """Cria um e-mail básico como fallback quando a API falha."""
+    if formatted_actions is None:
+        formatted_actions = [_fmt_action(item) for item in summary.action_items]
+    subject = f"Follow-up: {summary.title}" if summary.title else "Follow-up da reunião"
+    return EmailFollowUp(subject=subject, body=summary.summary, action_items=formatted_actions)
+
+
+def _build_user_prompt(
+    summary: MeetingSummary,
+    recipient_name: str | None,
+    extra_context: str | None,
+) -> tuple[str, list[str]]:
+    """Monta o prompt do usuário e retorna também os itens de ação formatados.
+
+    Cada lista é percorrida uma única vez; os itens de ação formatados são
+    reaproveitados no prompt e no fallback.
+    """
+    formatted_actions = [_fmt_action(item) for item in summary.action_items]
+
+    points_s = "\n".join("- " + p for p in summary.key_points)
+    decisions_s = "\n".join("- " + d for d in summary.decisions)
+    actions_s = "\n".join("- " + a for a in formatted_actions)
+    insights_s = "\n".join("- " + i for i in summary.insights)
+
+    user_prompt = (
+        f"Resumo da reunião:\n{summary.summary}\n\n"
+        f"Pontos principais:\n{points_s}\n\n"
+        f"Decisões:\n{decisions_s}\n\n"
+        f"Itens de ação:\n{actions_s}\n\n"
+        f"Insights:\n{insights_s}\n"
+    )
+
+    if recipient_name:
+        user_prompt += f"\nDestinatário: {recipient_name}\n"
+    if extra_context:
+        user_prompt += f"\nContexto adicional:\n{extra_context}\n"
+
+    return user_prompt, formatted_actions
+
+
+def parse_follow_up_email(
+    content: str,
+    summary: MeetingSummary,
+    formatted_actions: list[str] | None = None,
+) -> EmailFollowUp:
+    """Converte o JSON gerado pelo modelo em EmailFollowUp, com fallback básico."""
+    try:
+        parsed = orjson.loads(content) if orjson is not None else json.loads(content)
+    except ValueError:
+        logger.exception("Falha ao fazer parse do JSON do e-mail")
+        parsed = _extract_json_from_content(content)
+
+    if parsed:
+        try:
+            return EmailFollowUp.model_validate(parsed)
+        except Exception:
+            logger.exception("JSON do e-mail com estrutura inesperada")
+
+    logger.warning("Criando e-mail básico como fallback")
+    return _create_fallback_email(summary, formatted_actions)
+
+
+def stream_follow_up_email(
+    summary: MeetingSummary,
+    *,
+    model: str | None = None,
+    temperature: float | None = None,
+    recipient_name: str | None = None,
+    extra_context: str | None = None,
+) -> Iterator[str]:
+    """Gera o e-mail em streaming, emitindo os tokens conforme chegam da API.
+
+    O worker não fica bloqueado pela latência total do modelo: o chamador
+    (ex: ``st.write_stream``) renderiza incrementalmente, acumula o texto e
+    faz o parse final com :func:`parse_follow_up_email`.
+    """
+    settings = get_settings()
+    client = get_openai_client()
+
+    model = model or settings.summary_model
+    temperature = settings.summary_temperature if temperature is None else temperature
+
+    user_prompt, _ = _build_user_prompt(summary, recipient_name, extra_context)
+
+    logger.info("Gerando e-mail de follow-up (streaming) | modelo=%s", model)
+
+    response = client.chat.completions.create(
+        model=model,
+        messages=[{"role": "system", "content": _SYSTEM_PROMPT}, {"role": "user", "content": user_prompt}],
+        temperature=temperature,
+        response_format={"type": "json_object"},
+        max_tokens=2000,
+        stream=True,
+    )
+
+    for chunk in response:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if delta:
+            yield delta
+
+
+def generate_follow_up_email(
+    summary: MeetingSummary,
+    *,
+    model: str | None = None,
+    temperature: float | None = None,
+    recipient_name: str | None = None,
+    extra_context: str | None = None,
+) -> EmailFollowUp:
+    """Gera um e-mail de follow-up da reunião a partir da ata usando a API de chat."""
+    settings = get_settings()
+    client = get_openai_client()
+
+    model = model or settings.summary_model
+    temperature = settings.summary_temperature if temperature is None else temperature
+
+    user_prompt, formatted_actions = _build_user_prompt(summary, recipient_name, extra_context)
+
+    logger.info("Gerando e-mail de follow-up | modelo=%s", model)
+
+    try:
+        # Structured outputs: o SDK valida direto no schema do EmailFollowUp,
+        # sem o round-trip json.loads + model_validate do lado de cá
+        response = client.beta.chat.completions.parse(
+            model=model,
+            messages=[{"role": "system", "content": _SYSTEM_PROMPT}, {"role": "user", "content": user_prompt}],
+            temperature=temperature,
+            response_format=EmailFollowUp,
+            max_tokens=2000,
+        )
+
+        email = response.choices[0].message.parsed
+        if email is None:
+            logger.warning("Resposta sem conteúdo estruturado; criando e-mail básico como fallback")
+            email = _create_fallback_email(summary, formatted_actions)
+
+    except Exception:
+        logger.exception("Erro na API de e-mail de follow-up")
+        email = _create_fallback_email(summary, formatted_actions)
+
+    logger.info("E-mail de follow-up gerado com sucesso")
+    return email
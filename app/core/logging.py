@@ -3,23 +3,25 @@ from __future__ import annotations
 import logging
 import sys
 
+# Handler e formatter únicos de módulo: chamadas repetidas de setup_logging
+# (ex: hot-reload do Streamlit) não realocam nem duplicam handlers
+_FORMATTER = logging.Formatter(
+    fmt="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+_HANDLER = logging.StreamHandler(sys.stdout)
+_HANDLER.setFormatter(_FORMATTER)
+
 
 def setup_logging(verbose: bool = False) -> None:
     """
     Configura logging padrão.
     """
-    level = logging.DEBUG if verbose else logging.INFO
-    handler = logging.StreamHandler(sys.stdout)
-    formatter = logging.Formatter(
-        fmt="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-    handler.setFormatter(formatter)
-
     root = logging.getLogger()
-    root.handlers.clear()
-    root.addHandler(handler)
-    root.setLevel(level)
+    if _HANDLER not in root.handlers:
+        root.handlers.clear()
+        root.addHandler(_HANDLER)
+    root.setLevel(logging.DEBUG if verbose else logging.INFO)
 
 
 def get_logger(name: str) -> logging.Logger:
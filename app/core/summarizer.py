@@ -3,24 +3,120 @@ from __future__ import annotations
 import json
 import logging
 import re
+from typing import TYPE_CHECKING
+
+from openai import APIConnectionError, APIError
+from pydantic import ValidationError
+from pydantic_core import from_json
+
+# tiktoken dá contagem exata de tokens; opcional, com heurística de fallback
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
 
 from app.core.config import get_settings
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
 from app.models.summary import MeetingSummary
 from app.models.transcript import Transcript
 from app.services.openai_client import get_openai_client
+from app.services.summary_cache import MAX_CACHEABLE_TEMPERATURE, SummaryCache, exact_key
 
 logger = logging.getLogger(__name__)
 
+# Cache de resumos do processo: hits exatos e semânticos evitam o round-trip do modelo
+_SUMMARY_CACHE = SummaryCache()
+
 # Constante para limite de resumo
 SUMMARY_PREVIEW_LENGTH = 500
 
+# Instruções do sistema, compartilhadas com o caminho em lote (summarizer_batch).
+# Sem indentação embutida: o whitespace de recuo era enviado ao modelo e
+# cobrado como tokens de entrada em toda requisição
+SYSTEM_PROMPT = """Você é um assistente especialista em reuniões corporativas.
+Dado o transcript em português do Brasil, gere uma ata clara e objetiva.
+
+Retorne um JSON válido com a seguinte estrutura:
+{
+    "title": "Título da reunião (opcional)",
+    "summary": "Resumo executivo em português",
+    "key_points": ["Lista de pontos principais discutidos"],
+    "decisions": ["Lista de decisões tomadas"],
+    "action_items": [
+        {
+            "description": "Tarefa a ser executada",
+            "owner": "Responsável (opcional)",
+            "due_date": "Prazo (opcional, formato AAAA-MM-DD ou texto)"
+        }
+    ],
+    "insights": ["Lista de insights relevantes, métricas ou riscos identificados"]
+}
+
+Seja fiel ao conteúdo, use português natural e destaque decisões e tarefas importantes.
+Retorne APENAS o JSON, sem explicações adicionais."""
+
+# Cabeçalho do prompt do usuário, compartilhado com o caminho em lote
+USER_PROMPT_HEADER = (
+    "Transcrição em português do Brasil abaixo. Extraia uma ata clara, decisões, itens de ação e insights.\n\n"
+)
+
+# Acima deste total o transcript é resumido em map-reduce: custo/latência de
+# atenção crescem quadraticamente com o contexto
+MAX_PROMPT_TOKENS = 120_000
+_CHUNK_TOKENS = 30_000
+# Heurística conservadora para quando o tiktoken não está instalado
+_CHARS_PER_TOKEN = 4
+
+
+# Compilado uma vez; usado só como último recurso quando o scan linear falha
+_JSON_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def _extract_json_str(content: str) -> str | None:
+    """Extrai o trecho JSON bruto de uma string de conteúdo.
+
+    Scan linear de chaves balanceadas (ciente de strings/escapes): O(n)
+    determinístico, sem o backtracking do regex com DOTALL, e funciona quando
+    o modelo emite prosa após o JSON.
+    """
+    start = content.find("{")
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(content)):
+        ch = content[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return content[start : i + 1]
+
+    # JSON truncado/desbalanceado: tenta o regex ganancioso como fallback
+    json_match = _JSON_RE.search(content)
+    return json_match.group() if json_match else None
+
 
 def _extract_json_from_content(content: str) -> dict | None:
     """Extrai JSON de uma string de conteúdo."""
-    json_match = re.search(r"\{.*\}", content, re.DOTALL)
-    if json_match:
+    raw = _extract_json_str(content)
+    if raw:
         try:
-            return json.loads(json_match.group())
+            return json.loads(raw)
         except json.JSONDecodeError:
             return None
     return None
@@ -39,6 +135,179 @@ def _create_fallback_summary(text: str) -> MeetingSummary:
     )
 
 
+def _extract_text(transcript: Transcript | str) -> str:
+    """Extrai o texto do transcript, com fast path para os tipos esperados.
+
+    A comparação de identidade de tipo é um compare de ponteiro, sem o walk
+    de __mro__/metaclasse do isinstance contra um modelo Pydantic.
+    """
+    if type(transcript) is Transcript:
+        return transcript.text
+    if isinstance(transcript, str):
+        return transcript
+    # Caminho lento: subclasses de Transcript e objetos arbitrários
+    return transcript.text if isinstance(transcript, Transcript) else str(transcript)
+
+
+def _build_user_prompt(text: str, extra_context: str | None) -> str:
+    """Monta o prompt do usuário para a sumarização.
+
+    join único em vez de += : cada concatenação copiaria o acumulado inteiro,
+    o que pesa com transcripts de dezenas de KB.
+    """
+    parts = [USER_PROMPT_HEADER]
+    if extra_context:
+        parts.append(f"Contexto adicional:\n{extra_context}\n\n")
+    parts.append("Transcript:\n")
+    parts.append(text)
+    return "".join(parts)
+
+
+def _count_tokens(text: str, model: str) -> int:
+    """Conta tokens do texto; exato com tiktoken, heurística de chars sem ele."""
+    if tiktoken is not None:
+        try:
+            enc = tiktoken.encoding_for_model(model)
+        except KeyError:
+            enc = tiktoken.get_encoding("cl100k_base")
+        return len(enc.encode(text))
+    return len(text) // _CHARS_PER_TOKEN
+
+
+def _split_chunks(text: str, chunk_chars: int) -> list[str]:
+    """Divide o texto em blocos de até chunk_chars, cortando em fim de frase."""
+    chunks: list[str] = []
+    start = 0
+    n = len(text)
+    while n - start > chunk_chars:
+        limit = start + chunk_chars
+        cut = text.rfind(". ", start, limit)
+        if cut == -1:
+            cut = text.rfind("\n", start, limit)
+        cut = limit if cut <= start else cut + 1
+        chunks.append(text[start:cut])
+        start = cut
+    chunks.append(text[start:])
+    return chunks
+
+
+def _summarize_map_reduce(
+    text: str,
+    *,
+    model: str,
+    temperature: float,
+    extra_context: str | None,
+) -> MeetingSummary:
+    """Sumariza um transcript enorme em duas fases: por blocos e consolidação.
+
+    Cada bloco passa pelo summarize_transcript normal (aproveitando o cache de
+    resumos em re-execuções); as atas parciais são então consolidadas em uma
+    passada final sobre um contexto muito menor.
+    """
+    chunks = _split_chunks(text, _CHUNK_TOKENS * _CHARS_PER_TOKEN)
+    logger.info("Transcript acima do limite de contexto: map-reduce em %d blocos", len(chunks))
+
+    partials = [
+        summarize_transcript(
+            chunk,
+            model=model,
+            temperature=temperature,
+            extra_context="Este é um trecho parcial de uma reunião longa; resuma apenas o que está nele.",
+        )
+        for chunk in chunks
+    ]
+
+    combined = "\n\n".join(partial.model_dump_json() for partial in partials)
+    reduce_context = (
+        "O texto abaixo contém atas parciais (em JSON) de trechos consecutivos da MESMA reunião. "
+        "Consolide tudo em uma única ata coerente, sem repetir itens."
+    )
+    if extra_context:
+        reduce_context += f"\n{extra_context}"
+
+    return summarize_transcript(combined, model=model, temperature=temperature, extra_context=reduce_context)
+
+
+def summarize_transcript_stream(
+    transcript: Transcript | str,
+    *,
+    model: str | None = None,
+    temperature: float | None = None,
+    extra_context: str | None = None,
+) -> Iterator[MeetingSummary]:
+    """Gera a ata em streaming, emitindo visões parciais conforme o JSON chega.
+
+    Cada item emitido é um MeetingSummary construído via ``model_construct``
+    sobre o JSON parcial (``from_json(..., allow_partial)``), sem validação —
+    campos podem estar incompletos. O último item é validado estritamente.
+    A UI mostra resumo/pontos com latência de primeiro token, não de geração
+    completa.
+    """
+    settings = get_settings()
+    client = get_openai_client()
+
+    model = model or settings.summary_model
+    temperature = settings.summary_temperature if temperature is None else temperature
+
+    text = _extract_text(transcript)
+    user_prompt = _build_user_prompt(text, extra_context)
+
+    logger.info("Gerando ata/insights (streaming) | modelo=%s", model)
+
+    response = client.chat.completions.create(
+        model=model,
+        messages=[{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": user_prompt}],
+        temperature=temperature,
+        response_format={"type": "json_object"},
+        max_tokens=4000,
+        stream=True,
+    )
+
+    parts: list[str] = []
+    for chunk in response:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if not delta:
+            continue
+        parts.append(delta)
+        try:
+            obj = from_json("".join(parts), allow_partial="trailing-strings")
+        except ValueError:
+            continue
+        if isinstance(obj, dict):
+            yield MeetingSummary.model_construct(**obj)
+
+    content = "".join(parts)
+    summary = _parse_summary_content(content)
+    if summary is None:
+        logger.warning("JSON final do streaming inválido; criando resumo básico como fallback")
+        summary = _create_fallback_summary(text)
+    yield summary
+
+
+def _parse_summary_content(content: str | None) -> MeetingSummary | None:
+    """Valida o JSON retornado pelo modelo; None quando não há resumo aproveitável.
+
+    model_validate_json faz parse+validação em uma passada (jiter), sem o
+    dict intermediário de json.loads + model_validate.
+    """
+    if not content:
+        logger.warning("Resposta da API sem conteúdo")
+        return None
+    try:
+        return MeetingSummary.model_validate_json(content)
+    except ValidationError:
+        logger.exception("Falha ao fazer parse do JSON")
+        logger.debug("Resposta recebida: %s", content[:500])
+
+    raw = _extract_json_str(content)
+    if not raw:
+        return None
+    try:
+        return MeetingSummary.model_validate_json(raw)
+    except ValidationError:
+        return None
+
+
 def summarize_transcript(
     transcript: Transcript | str,
     *,
@@ -53,40 +322,26 @@ def summarize_transcript(
     model = model or settings.summary_model
     temperature = settings.summary_temperature if temperature is None else temperature
 
-    text = transcript.text if isinstance(transcript, Transcript) else str(transcript)
+    text = _extract_text(transcript)
+
+    # Reuniões de várias horas não entram inteiras no contexto: map-reduce
+    if _count_tokens(text, model) > MAX_PROMPT_TOKENS:
+        return _summarize_map_reduce(text, model=model, temperature=temperature, extra_context=extra_context)
 
     # Instruções do sistema
-    system_prompt = """Você é um assistente especialista em reuniões corporativas.
-    Dado o transcript em português do Brasil, gere uma ata clara e objetiva.
-
-    Retorne um JSON válido com a seguinte estrutura:
-    {
-        "title": "Título da reunião (opcional)",
-        "summary": "Resumo executivo em português",
-        "key_points": ["Lista de pontos principais discutidos"],
-        "decisions": ["Lista de decisões tomadas"],
-        "action_items": [
-            {
-                "description": "Tarefa a ser executada",
-                "owner": "Responsável (opcional)",
-                "due_date": "Prazo (opcional, formato AAAA-MM-DD ou texto)"
-            }
-        ],
-        "insights": ["Lista de insights relevantes, métricas ou riscos identificados"]
-    }
-
-    Seja fiel ao conteúdo, use português natural e destaque decisões e tarefas importantes.
-    Retorne APENAS o JSON, sem explicações adicionais."""
+    system_prompt = SYSTEM_PROMPT
 
     # Prompt do usuário
-    user_prompt = (
-        "Transcrição em português do Brasil abaixo. Extraia uma ata clara, decisões, itens de ação e insights.\n\n"
-    )
+    user_prompt = _build_user_prompt(text, extra_context)
 
-    if extra_context:
-        user_prompt += f"Contexto adicional:\n{extra_context}\n\n"
-
-    user_prompt += f"Transcript:\n{text}"
+    # Só chamadas (quase) determinísticas são cacheáveis; o lookup exato não
+    # custa nada e o semântico paga apenas um embedding em vez do chat
+    cacheable = temperature <= MAX_CACHEABLE_TEMPERATURE
+    cache_key = exact_key(model, temperature, system_prompt, user_prompt) if cacheable else ""
+    if cacheable:
+        cached = _SUMMARY_CACHE.get(cache_key, text)
+        if cached is not None:
+            return cached
 
     logger.info("Gerando ata/insights | modelo=%s", model)
 
@@ -99,23 +354,10 @@ def summarize_transcript(
             response_format={"type": "json_object"},
             max_tokens=4000,
         )
-
         content = response.choices[0].message.content
 
-        try:
-            parsed = json.loads(content)
-        except json.JSONDecodeError as e:
-            logger.exception("Falha ao fazer parse do JSON")
-            logger.debug("Resposta recebida: %s", content[:500])
-
-            parsed = _extract_json_from_content(content)
-            if not parsed:
-                msg = f"Não foi possível extrair JSON válido da resposta: {e}"
-                raise ValueError(msg) from e
-
-        summary = MeetingSummary.model_validate(parsed)
-
-    except Exception as e:
+    except (APIError, APIConnectionError, TimeoutError) as e:
+        # Só erro de rede/API justifica uma segunda passada (paga) no modelo
         logger.exception("Erro na API de resumo")
         logger.info("Tentando fallback sem response_format...")
 
@@ -128,18 +370,32 @@ def summarize_transcript(
             )
 
             content = response.choices[0].message.content
-            parsed = _extract_json_from_content(content)
+            raw = _extract_json_str(content)
 
-            if parsed:
-                summary = MeetingSummary.model_validate(parsed)
+            if raw:
+                summary = MeetingSummary.model_validate_json(raw)
             else:
                 logger.warning("Criando resumo básico como fallback")
                 summary = _create_fallback_summary(text)
+                cacheable = False
 
         except Exception as fallback_error:
             logger.exception("Fallback também falhou")
             msg = f"Não foi possível gerar o resumo: {e}"
             raise ValueError(msg) from fallback_error
 
+    else:
+        # Falha de validação não refaz a chamada: cai direto no resumo básico
+        summary = _parse_summary_content(content)
+        if summary is None:
+            logger.warning("Criando resumo básico como fallback")
+            summary = _create_fallback_summary(text)
+            cacheable = False
+
+    # Só saída validada do modelo entra no cache: um stub de fallback cacheado
+    # serviria lixo para todo transcript igual ou semanticamente próximo
+    if cacheable:
+        _SUMMARY_CACHE.put(cache_key, text, summary)
+
     logger.info("Ata/insights gerados com sucesso")
     return summary
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from app.core.config import get_settings
+from app.core.summarizer import SYSTEM_PROMPT, USER_PROMPT_HEADER
+from app.models.summary import MeetingSummary
+from app.models.transcript import Transcript
+from app.services.openai_client import get_openai_client
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+
+logger = logging.getLogger(__name__)
+
+# Janela de conclusão da Batch API (~50% do custo por token dos requests online)
+_COMPLETION_WINDOW = "24h"
+
+
+def _batch_line(custom_id: str, text: str, model: str, temperature: float) -> str:
+    """Monta uma linha JSONL de requisição da Batch API para um transcript."""
+    user_prompt = f"{USER_PROMPT_HEADER}Transcript:\n{text}"
+    return json.dumps(
+        {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": user_prompt},
+                ],
+                "temperature": temperature,
+                "response_format": {"type": "json_object"},
+                "max_tokens": 4000,
+            },
+        },
+        ensure_ascii=False,
+    )
+
+
+def summarize_transcripts_batch(
+    transcripts: Mapping[str, Transcript | str],
+    *,
+    model: str | None = None,
+    temperature: float | None = None,
+) -> str:
+    """Submete vários transcripts para sumarização via Batch API.
+
+    Indicado para cargas offline (backfill, arquivos): o lote roda fora dos
+    limites de RPM online e custa cerca de metade por token. Retorna o id do
+    batch; acompanhe com :func:`wait_for_batch`. Para chamadas interativas,
+    use :func:`app.core.summarizer.summarize_transcript`.
+    """
+    settings = get_settings()
+    client = get_openai_client()
+
+    model = model or settings.summary_model
+    temperature = settings.summary_temperature if temperature is None else temperature
+
+    lines = (
+        _batch_line(
+            custom_id,
+            transcript.text if isinstance(transcript, Transcript) else str(transcript),
+            model,
+            temperature,
+        )
+        for custom_id, transcript in transcripts.items()
+    )
+    payload = "\n".join(lines).encode()
+
+    batch_file = client.files.create(file=io.BytesIO(payload), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window=_COMPLETION_WINDOW,
+    )
+
+    logger.info("Batch de resumos submetido | id=%s | itens=%d", batch.id, len(transcripts))
+    return batch.id
+
+
+def wait_for_batch(batch_id: str, poll: float = 30.0) -> Iterator[tuple[str, MeetingSummary]]:
+    """Aguarda a conclusão do batch e itera (custom_id, MeetingSummary).
+
+    Linhas com erro ou JSON inválido são registradas e puladas, para não
+    descartar o restante do lote.
+    """
+    client = get_openai_client()
+
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        if batch.status == "completed":
+            break
+        if batch.status in {"failed", "expired", "cancelled"}:
+            msg = f"Batch {batch_id} terminou com status '{batch.status}'"
+            raise ValueError(msg)
+        logger.info("Batch %s ainda em '%s'; aguardando %.0fs", batch_id, batch.status, poll)
+        time.sleep(poll)
+
+    output = client.files.content(batch.output_file_id)
+    for raw_line in output.text.splitlines():
+        if not raw_line:
+            continue
+        line = json.loads(raw_line)
+        custom_id = line.get("custom_id", "")
+        response = line.get("response") or {}
+        if response.get("status_code") != 200:  # noqa: PLR2004
+            logger.warning("Item %s do batch falhou | status=%s", custom_id, response.get("status_code"))
+            continue
+        content = response["body"]["choices"][0]["message"]["content"]
+        try:
+            yield custom_id, MeetingSummary.model_validate_json(content)
+        except Exception:
+            logger.exception("Item %s do batch com JSON inválido; pulando", custom_id)
@@ -1,69 +1,90 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
-import mimetypes
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from functools import lru_cache
 from pathlib import Path
 from typing import Literal
 
 from app.core.config import get_settings
-from app.models.transcript import Transcript
-from app.services.openai_client import get_openai_client
+from app.models.transcript import Transcript, TranscriptSegment
+from app.services.openai_client import get_async_openai_client, get_openai_client
 
 logger = logging.getLogger(__name__)
 
-# Garantir mapeamentos comuns para reconhecimento do tipo
-mimetypes.add_type("audio/mp4", ".m4a")
-mimetypes.add_type("audio/mpeg", ".mp3")
-mimetypes.add_type("audio/wav", ".wav")
-
 SupportedResponseFormat = Literal["text", "json", "verbose_json", "srt", "vtt"]
 
-SUPPORTED_EXTS = {".mp3", ".wav", ".m4a"}
-SUPPORTED_MIMES = {
-    "audio/mpeg",
-    "audio/wav",
-    "audio/x-wav",
-    "audio/mp4",
-    "audio/x-m4a",
-    "video/mp4",  # alguns sistemas identificam m4a como video/mp4
+SUPPORTED_EXTS = frozenset({".mp3", ".wav", ".m4a"})
+SUPPORTED_MIMES = frozenset(
+    {
+        "audio/mpeg",
+        "audio/wav",
+        "audio/x-wav",
+        "audio/mp4",
+        "audio/x-m4a",
+        "video/mp4",  # alguns sistemas identificam m4a como video/mp4
+    }
+)
+
+
+# Lookup local O(1) em vez do registro global do mimetypes (que exigia
+# add_type no import e faz probing interno a cada guess_type)
+_EXT_TO_MIME = {
+    ".mp3": "audio/mpeg",
+    ".wav": "audio/wav",
+    ".m4a": "audio/mp4",
 }
 
 
-def _detect_mime(file_path: str) -> str:
-    mime, _ = mimetypes.guess_type(file_path)
-    return mime or "application/octet-stream"
+def _detect_mime(path_obj: Path) -> str:
+    return _EXT_TO_MIME.get(path_obj.suffix.lower(), "application/octet-stream")
 
 
-def _ensure_audio(file_path: str) -> None:
-    path_obj = Path(file_path)
+def _ensure_audio(path_obj: Path) -> None:
     if not path_obj.is_file():
-        msg = f"Arquivo não encontrado: {file_path}"
+        msg = f"Arquivo não encontrado: {path_obj}"
         raise FileNotFoundError(msg)
 
+    # Extensão conhecida resolve sem consultar o MIME
     ext = path_obj.suffix.lower()
-    mime = _detect_mime(file_path)
+    if ext in SUPPORTED_EXTS:
+        return
 
-    if ext in SUPPORTED_EXTS or mime in SUPPORTED_MIMES:
+    mime = _detect_mime(path_obj)
+    if mime in SUPPORTED_MIMES:
         return
 
-    msg = f"Formato de arquivo não suportado: {mime or ext} ({file_path}). Use .mp3, .wav ou .m4a."
+    msg = f"Formato de arquivo não suportado: {mime or ext} ({path_obj}). Use .mp3, .wav ou .m4a."
     raise ValueError(msg)
 
 
-def _is_gpt4o_transcribe(model: str) -> bool:
-    m = (model or "").lower()
-    return m.startswith("gpt-4o-transcribe")
+def _is_gpt4o_transcribe(model_lc: str) -> bool:
+    """Recebe o nome do modelo já normalizado em minúsculas."""
+    return model_lc.startswith("gpt-4o-transcribe")
 
 
-def _is_whisper_model(model: str) -> bool:
-    m = (model or "").lower()
-    return m.startswith("whisper")
+def _is_whisper_model(model_lc: str) -> bool:
+    """Recebe o nome do modelo já normalizado em minúsculas."""
+    return model_lc.startswith("whisper")
 
 
+@lru_cache(maxsize=64)
 def _validate_model_and_format(model: str, response_format: SupportedResponseFormat) -> None:
-    """Valida compatibilidade entre modelo e formato."""
-    if _is_gpt4o_transcribe(model):
+    """Valida compatibilidade entre modelo e formato.
+
+    Memoizado por (modelo, formato): o par raramente muda dentro de uma
+    execução, então lotes grandes pagam a validação uma vez. Exceções não
+    são cacheadas pelo lru_cache, logo combinações inválidas continuam
+    levantando erro a cada chamada.
+    """
+    # Normaliza uma única vez; cada .lower() alocaria uma string nova
+    model_lc = (model or "").lower()
+    if _is_gpt4o_transcribe(model_lc):
         if response_format not in {"json", "text"}:
             msg = (
                 f"O modelo '{model}' não suporta '{response_format}'. "
@@ -71,7 +92,7 @@ def _validate_model_and_format(model: str, response_format: SupportedResponseFor
                 "se precisar de 'verbose_json'/'srt'/'vtt'."
             )
             raise ValueError(msg)
-    elif _is_whisper_model(model):
+    elif _is_whisper_model(model_lc):
         if response_format not in {"text", "json", "verbose_json", "srt", "vtt"}:
             msg = (
                 f"O formato '{response_format}' não é suportado por '{model}'. "
@@ -87,25 +108,52 @@ def _validate_model_and_format(model: str, response_format: SupportedResponseFor
 
 
 def _convert_result_to_dict(obj: object) -> dict:
-    """Converte objeto da API para dicionário."""
-    for attr in ("to_dict", "model_dump", "dict"):
-        fn = getattr(obj, attr, None)
-        if callable(fn):
-            try:
-                d = fn()
-                if isinstance(d, dict):
-                    return d
-            except Exception:
-                logger.debug("Falha ao converter com %s", attr)
-
-    for attr in ("model_dump_json",):
-        fn = getattr(obj, attr, None)
-        if callable(fn):
-            try:
-                return json.loads(fn())
-            except Exception:
-                logger.debug("Falha ao converter JSON com %s", attr)
-    return {}
+    """Converte objeto da API para dicionário.
+
+    As respostas do SDK são modelos Pydantic v2: model_dump resolve direto,
+    sem a cadeia de getattr/try por atributo nem round-trip por JSON.
+    """
+    dump = getattr(obj, "model_dump", None)
+    if dump is not None:
+        try:
+            d = dump()
+            if isinstance(d, dict):
+                return d
+        except Exception:
+            logger.debug("Falha ao converter com model_dump")
+    return dict(getattr(obj, "__dict__", None) or {})
+
+
+# Cue SRT/VTT: timestamps HH:MM:SS,mmm (SRT) ou HH:MM:SS.mmm (VTT); o contador
+# numérico do SRT é opcional, então o mesmo padrão cobre os dois formatos.
+# Compilado uma vez; findall é um único scan em C sobre o texto inteiro
+_CUE_TIME = r"(\d{2}):(\d{2}):(\d{2})[,.](\d{3})"
+_CUE_RE = re.compile(rf"{_CUE_TIME}\s*-->\s*{_CUE_TIME}[^\n]*\n(.*?)(?=\n\s*\n|\Z)", re.DOTALL)
+
+_SECONDS_PER_HOUR = 3600
+_SECONDS_PER_MINUTE = 60
+
+
+def _parse_cue_segments(text: str) -> list[TranscriptSegment] | None:
+    """Extrai segmentos com timestamps de um corpo SRT/VTT; None se não houver."""
+    segments = [
+        TranscriptSegment.model_construct(
+            start=int(h1) * _SECONDS_PER_HOUR + int(m1) * _SECONDS_PER_MINUTE + int(s1) + int(ms1) / 1000,
+            end=int(h2) * _SECONDS_PER_HOUR + int(m2) * _SECONDS_PER_MINUTE + int(s2) + int(ms2) / 1000,
+            text=body.strip(),
+            speaker=None,
+        )
+        for h1, m1, s1, ms1, h2, m2, s2, ms2, body in _CUE_RE.findall(text)
+    ]
+    return segments or None
+
+
+def _extract_text(result: object) -> str:
+    """Extrai o texto do resultado da API, convertendo para dict só se preciso."""
+    text_value = getattr(result, "text", None)
+    if isinstance(text_value, str):
+        return text_value
+    return _convert_result_to_dict(result).get("text") or ""
 
 
 def _process_transcription_result(
@@ -119,18 +167,19 @@ def _process_transcription_result(
         data = _convert_result_to_dict(result)
         return Transcript.from_verbose_json(data, fallback_language=language, source_path=file_path)
 
+    text_value = _extract_text(result)
+
     if response_format in ("srt", "vtt"):
-        text_value = getattr(result, "text", None)
-        if not isinstance(text_value, str):
-            data = _convert_result_to_dict(result)
-            text_value = data.get("text") or ""
-        return Transcript(text=text_value, language=language, segments=None, source_path=file_path)
+        # Os timestamps já vieram de graça no corpo; extraí-los evita uma
+        # segunda chamada em verbose_json quando o chamador quer segmentos
+        return Transcript(
+            text=text_value,
+            language=language,
+            segments=_parse_cue_segments(text_value),
+            source_path=file_path,
+        )
 
     # Para 'text' e 'json'
-    text_value = getattr(result, "text", None)
-    if not isinstance(text_value, str):
-        data = _convert_result_to_dict(result)
-        text_value = data.get("text") or ""
     return Transcript(text=text_value, language=language, segments=None, source_path=file_path)
 
 
@@ -144,7 +193,9 @@ def transcribe_file(
 ) -> Transcript:
     """Transcreve arquivo de áudio usando OpenAI."""
     settings = get_settings()
-    _ensure_audio(file_path)
+    # Um único Path por chamada, repassado aos helpers
+    path_obj = Path(file_path)
+    _ensure_audio(path_obj)
 
     model = model or settings.default_transcribe_model
     language = language or settings.default_language
@@ -156,11 +207,13 @@ def transcribe_file(
 
     logger.info("Iniciando transcrição | arquivo=%s | modelo=%s | formato=%s", file_path, model, response_format)
 
-    path_obj = Path(file_path)
-    with path_obj.open("rb") as f:
+    # Buffer de 4 MiB: menos syscalls de leitura durante o upload em streaming
+    with path_obj.open("rb", buffering=4 * 1024 * 1024) as f:
+        # Tupla (nome, fileobj, mime): o httpx faz upload multipart em
+        # streaming a partir do handle, sem carregar o áudio inteiro na RAM
         params = {
             "model": model,
-            "file": f,
+            "file": (path_obj.name, f, _detect_mime(path_obj)),
             "language": language,
         }
         if prompt:
@@ -180,19 +233,264 @@ def transcribe_file(
     return transcript
 
 
-def save_transcript(transcript: Transcript, output_path: str, as_format: Literal["json", "txt"] = "json") -> None:
-    """Salva a transcrição em JSON (modelo Pydantic) ou texto simples."""
+# Limite de chamadas simultâneas à API de transcrição
+DEFAULT_CONCURRENCY = 8
+
+
+async def _atranscribe_one(  # noqa: PLR0913
+    path_obj: Path,
+    sem: asyncio.Semaphore,
+    *,
+    model: str,
+    language: str,
+    response_format: SupportedResponseFormat,
+    prompt: str | None,
+) -> Transcript:
+    """Transcreve um arquivo sob o semáforo, com o cliente assíncrono."""
+    client = get_async_openai_client()
+
+    async with sem:
+        logger.info("Iniciando transcrição | arquivo=%s | modelo=%s | formato=%s", path_obj, model, response_format)
+        # Passar o Path deixa o SDK ler o arquivo fora do event loop
+        params = {
+            "model": model,
+            "file": path_obj,
+            "language": language,
+            "response_format": response_format,
+        }
+        if prompt:
+            params["prompt"] = prompt
+
+        try:
+            result = await client.audio.transcriptions.create(**params)
+        except Exception:
+            logger.exception("Erro na API de transcrição | arquivo=%s", path_obj)
+            raise
+
+    return _process_transcription_result(result, response_format, language, str(path_obj))
+
+
+async def transcribe_files(  # noqa: PLR0913
+    file_paths: list[str],
+    *,
+    model: str | None = None,
+    language: str | None = None,
+    response_format: SupportedResponseFormat | None = None,
+    prompt: str | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> list[Transcript]:
+    """Transcreve vários arquivos em paralelo (limitado por semáforo).
+
+    Cada chamada é limitada pela rede, não por CPU local: o ganho é próximo
+    de linear até o teto de concorrência. A ordem dos resultados segue a
+    ordem de ``file_paths``.
+    """
+    settings = get_settings()
+
+    model = model or settings.default_transcribe_model
+    language = language or settings.default_language
+    response_format = response_format or settings.default_response_format
+
+    _validate_model_and_format(model, response_format)
+    # Valida tudo antes de abrir qualquer conexão, com um Path por arquivo
+    paths = [Path(file_path) for file_path in file_paths]
+    for path_obj in paths:
+        _ensure_audio(path_obj)
+
+    # TaskGroup: concorrência estruturada — uma falha cancela as demais tasks
+    # em vez de deixá-las órfãs como o gather
+    sem = asyncio.Semaphore(concurrency)
+    async with asyncio.TaskGroup() as tg:
+        tasks = [
+            tg.create_task(
+                _atranscribe_one(
+                    path_obj,
+                    sem,
+                    model=model,
+                    language=language,
+                    response_format=response_format,
+                    prompt=prompt,
+                )
+            )
+            for path_obj in paths
+        ]
+    return [task.result() for task in tasks]
+
+
+def _probe_duration(path_obj: Path) -> float | None:
+    """Duração do áudio em segundos via ffprobe; None se indisponível."""
+    # Caminho absoluto via shutil.which: não depende do PATH no exec (S607)
+    ffprobe = shutil.which("ffprobe")
+    if ffprobe is None:
+        return None
+    try:
+        out = subprocess.run(  # noqa: S603
+            [
+                ffprobe,
+                "-v",
+                "error",
+                "-show_entries",
+                "format=duration",
+                "-of",
+                "csv=p=0",
+                str(path_obj),
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return float(out.stdout.strip())
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        return None
+
+
+def _rebase_segments(segments: list[TranscriptSegment], offset: float, end: float) -> list[TranscriptSegment]:
+    """Seleciona os segmentos dentro de [offset, end) e re-baseia os tempos."""
+    return [
+        TranscriptSegment.model_construct(
+            start=None if seg.start is None else seg.start - offset,
+            end=None if seg.end is None else seg.end - offset,
+            text=seg.text,
+            speaker=seg.speaker,
+        )
+        for seg in segments
+        if seg.start is not None and offset <= seg.start < end
+    ]
+
+
+def transcribe_files_batched(
+    file_paths: list[str],
+    *,
+    max_duration_s: float = 600.0,
+    model: str | None = None,
+    language: str | None = None,
+    prompt: str | None = None,
+) -> list[Transcript]:
+    """Transcreve vários clipes curtos com uma única chamada à API.
+
+    Concatena os arquivos com ffmpeg (stream copy), transcreve o áudio
+    resultante em verbose_json e reparte os segmentos por arquivo usando a
+    tabela de offsets — um round-trip HTTP em vez de N. Requer ffmpeg/ffprobe,
+    arquivos de mesma extensão e um modelo whisper (verbose_json); qualquer
+    pré-condição não atendida cai no caminho arquivo a arquivo.
+    """
+    settings = get_settings()
+    model = model or settings.default_transcribe_model
+    language = language or settings.default_language
+
+    paths = [Path(file_path) for file_path in file_paths]
+    for path_obj in paths:
+        _ensure_audio(path_obj)
+
+    def _fallback() -> list[Transcript]:
+        return [transcribe_file(str(path_obj), model=model, language=language, prompt=prompt) for path_obj in paths]
+
+    if len(paths) < 2 or not _is_whisper_model(model.lower()):  # noqa: PLR2004
+        return _fallback()
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None or shutil.which("ffprobe") is None:
+        logger.info("ffmpeg/ffprobe indisponíveis; transcrevendo arquivo a arquivo")
+        return _fallback()
+    if len({path_obj.suffix.lower() for path_obj in paths}) != 1:
+        logger.info("Extensões mistas; transcrevendo arquivo a arquivo")
+        return _fallback()
+
+    durations = [_probe_duration(path_obj) for path_obj in paths]
+    if any(d is None for d in durations) or sum(durations) > max_duration_s:
+        return _fallback()
+
+    # Tabela de offsets acumulados: início de cada clipe no áudio concatenado
+    offsets: list[float] = []
+    total = 0.0
+    for duration in durations:
+        offsets.append(total)
+        total += duration
+
+    suffix = paths[0].suffix.lower()
+    with tempfile.TemporaryDirectory(prefix="clareia_batch_") as tmp_dir:
+        tmp = Path(tmp_dir)
+        list_file = tmp / "list.txt"
+        list_file.write_text("".join(f"file '{path_obj.resolve()}'\n" for path_obj in paths), encoding="utf-8")
+        merged = tmp / f"merged{suffix}"
+
+        try:
+            subprocess.run(  # noqa: S603
+                [
+                    ffmpeg,
+                    "-loglevel",
+                    "error",
+                    "-f",
+                    "concat",
+                    "-safe",
+                    "0",
+                    "-i",
+                    str(list_file),
+                    "-c",
+                    "copy",
+                    str(merged),
+                ],
+                check=True,
+            )
+        except (OSError, subprocess.CalledProcessError):
+            logger.exception("Concatenação ffmpeg falhou; transcrevendo arquivo a arquivo")
+            return _fallback()
+
+        logger.info("Transcrevendo %d clipes em uma única chamada (%.0fs de áudio)", len(paths), total)
+        merged_transcript = transcribe_file(
+            str(merged),
+            model=model,
+            language=language,
+            response_format="verbose_json",
+            prompt=prompt,
+        )
+
+    all_segments = merged_transcript.segments or []
+    results: list[Transcript] = []
+    for path_obj, offset, duration in zip(paths, offsets, durations, strict=True):
+        segments = _rebase_segments(all_segments, offset, offset + duration)
+        results.append(
+            Transcript.model_construct(
+                text=" ".join(seg.text.strip() for seg in segments),
+                language=merged_transcript.language,
+                segments=segments or None,
+                source_path=str(path_obj),
+            )
+        )
+    return results
+
+
+def save_transcript(
+    transcript: Transcript,
+    output_path: str,
+    as_format: Literal["json", "txt"] = "json",
+    *,
+    fsync: bool = False,
+) -> None:
+    """Salva a transcrição em JSON (modelo Pydantic) ou texto simples.
+
+    O payload é serializado inteiro em memória e escrito com um único
+    os.write, sem o BufferedWriter intermediário; ``fsync=True`` força a
+    durabilidade em disco quando o chamador precisar.
+    """
     path_obj = Path(output_path).resolve()
     path_obj.parent.mkdir(parents=True, exist_ok=True)
 
     if as_format == "json":
-        with path_obj.open("w", encoding="utf-8") as f:
-            json.dump(transcript.model_dump(), f, ensure_ascii=False, indent=2)
+        # Serialização direta em Rust (pydantic-core), sem o dict intermediário
+        # de model_dump + json.dump
+        payload = transcript.model_dump_json(indent=2).encode()
     elif as_format == "txt":
-        with path_obj.open("w", encoding="utf-8") as f:
-            f.write(transcript.text)
+        payload = transcript.text.encode()
     else:
         msg = f"Formato de saída não suportado: {as_format}"
         raise ValueError(msg)
 
+    fd = os.open(path_obj, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, payload)
+        if fsync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
     logger.info("Transcrição salva em %s", output_path)
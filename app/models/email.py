@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from functools import cached_property
+from html import escape
+
+from pydantic import BaseModel, ConfigDict, Field
+
+# Cascas estáticas montadas uma vez no import; as chamadas só preenchem os
+# campos dinâmicos via format_map, sem reconcatenar o esqueleto
+_TEXT_SHELL = "{greeting}\n\n{body}{actions_block}\n\n{closing}"
+
+_HTML_SHELL = "<html><body><p>{greeting}</p><p>{body}</p>{actions_block}<p>{closing}</p></body></html>"
+
+_HTML_ACTIONS_SHELL = "<p><strong>Próximos passos:</strong></p><ul>{items}</ul>"
+
+
+class EmailFollowUp(BaseModel):
+    # Imutável após a geração; o cached_property de HTML continua funcionando
+    # porque escreve direto no __dict__ da instância
+    model_config = ConfigDict(frozen=True)
+
+    subject: str = Field(description="Assunto do e-mail")
+    greeting: str = Field(default="Olá,", description="Saudação inicial")
+    body: str = Field(description="Corpo principal do e-mail em português")
+    action_items: list[str] = Field(default_factory=list, description="Próximos passos destacados no e-mail")
+    closing: str = Field(default="Atenciosamente,", description="Encerramento")
+
+    def to_plain_text(self) -> str:
+        """Renderiza o e-mail em texto puro."""
+        actions_block = ""
+        if self.action_items:
+            items = "\n".join(["- " + item for item in self.action_items])
+            actions_block = f"\n\nPróximos passos:\n{items}"
+        return _TEXT_SHELL.format_map(
+            {"greeting": self.greeting, "body": self.body, "actions_block": actions_block, "closing": self.closing}
+        )
+
+    @cached_property
+    def _rendered_html(self) -> str:
+        """HTML renderizado uma única vez por instância (campos escapados)."""
+        actions_block = ""
+        if self.action_items:
+            items = "".join(["<li>" + escape(item) + "</li>" for item in self.action_items])
+            actions_block = _HTML_ACTIONS_SHELL.format_map({"items": items})
+        return _HTML_SHELL.format_map(
+            {
+                "greeting": escape(self.greeting),
+                "body": escape(self.body),
+                "actions_block": actions_block,
+                "closing": escape(self.closing),
+            }
+        )
+
+    def to_html(self) -> str:
+        """Renderiza o e-mail em HTML simples.
+
+        O conteúdo vem do modelo de linguagem: escapar aqui evita HTML/script
+        injetado no e-mail e dispensa sanitização posterior do render inteiro.
+        """
+        return self._rendered_html
@@ -1,9 +1,19 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from typing import Final
+
+from pydantic import BaseModel, ConfigDict, Field
+
+# Constante de módulo: uma única instância da string, sem rebuild por chamada
+SYSTEM_INSTRUCTIONS: Final[str] = (
+    "Você é um assistente especialista em reuniões corporativas. Dado o transcript em português do Brasil, "
+    "gere uma ata clara e objetiva. Seja fiel ao conteúdo; use português natural; destaque decisões e tarefas."
+)
 
 
 class ActionItem(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     description: str = Field(description="Tarefa a ser executada")
     owner: str | None = Field(default=None, description="Responsável (se identificado)")
     due_date: str | None = Field(default=None, description="Prazo sugerido (AAAA-MM-DD ou texto)")
@@ -17,9 +27,29 @@ class MeetingSummary(BaseModel):
     action_items: list[ActionItem] = Field(default_factory=list, description="Ações a serem tomadas")
     insights: list[str] = Field(default_factory=list, description="Insights relevantes/métricas/risco")
 
+    def to_markdown(self) -> str:
+        """Renderiza a ata em Markdown."""
+        # Listas em vez de generators: str.join dimensiona o buffer em uma passada
+        newline = "\n"
+        return f"""# {self.title or "Ata da Reunião"}
+
+## Resumo
+{self.summary}
+
+## Pontos Principais
+{newline.join(["- " + p for p in self.key_points])}
+
+## Decisões
+{newline.join(["- " + d for d in self.decisions])}
+
+## Ações
+{newline.join(["- " + a.description for a in self.action_items])}
+
+## Insights
+{newline.join(["- " + i for i in self.insights])}
+"""
+
     @staticmethod
     def system_instructions() -> str:
-        return (
-            "Você é um assistente especialista em reuniões corporativas. Dado o transcript em português do Brasil, "
-            "gere uma ata clara e objetiva. Seja fiel ao conteúdo; use português natural; destaque decisões e tarefas."
-        )
+        """Mantido por compatibilidade; prefira a constante SYSTEM_INSTRUCTIONS."""
+        return SYSTEM_INSTRUCTIONS
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class TranscriptSegment(BaseModel):
+    # Imutável: milhares de instâncias por reunião, sem __pydantic_fields_set__
+    # rastreando mutação que nunca acontece
+    model_config = ConfigDict(frozen=True)
+
     start: float | None = Field(default=None, description="Início do segmento em segundos")
     end: float | None = Field(default=None, description="Fim do segmento em segundos")
     text: str = Field(description="Texto do segmento")
@@ -18,18 +22,54 @@ class Transcript(BaseModel):
     )
     source_path: str | None = Field(default=None, description="Caminho do arquivo de origem")
 
+    def preview(self, n: int = 4000) -> tuple[str, bool]:
+        """Retorna até ``n`` caracteres do texto e se houve truncamento.
+
+        Com segmentos disponíveis, concatena apenas o necessário em vez de
+        montar o texto completo; sem segmentos, sonda um único caractere além
+        do corte em vez de medir a string inteira.
+        """
+        if self.segments:
+            parts: list[str] = []
+            total = 0
+            for seg in self.segments:
+                parts.append(seg.text)
+                total += len(seg.text)
+                if total > n:
+                    break
+            return "".join(parts)[:n], total > n
+        return self.text[:n], bool(self.text[n : n + 1])
+
     @staticmethod
     def from_verbose_json(data: dict, fallback_language: str = "pt", source_path: str | None = None) -> Transcript:
         text = data.get("text") or ""
         lang = data.get("language") or fallback_language
         raw_segments = data.get("segments") or []
-        segments = []
-        for s in raw_segments:
-            segments.append(
-                TranscriptSegment(
-                    start=s.get("start"),
-                    end=s.get("end"),
+
+        # verbose_json vem direto da API: model_construct pula o validador
+        # Pydantic por segmento (milhares em reuniões longas); a coerção para
+        # float é feita inline e um try único cobre o lote inteiro. List comp
+        # usa o bytecode LIST_APPEND, sem o dispatch de .append por item
+        try:
+            segments = [
+                TranscriptSegment.model_construct(
+                    start=None if (start := s.get("start")) is None else float(start),
+                    end=None if (end := s.get("end")) is None else float(end),
                     text=s.get("text") or "",
+                    speaker=None,
                 )
-            )
-        return Transcript(text=text, language=lang, segments=segments or None, source_path=source_path)
+                for s in raw_segments
+            ]
+        except (TypeError, ValueError, AttributeError):
+            # Payload fora do contrato: refaz com validação completa
+            segments = [
+                TranscriptSegment(start=s.get("start"), end=s.get("end"), text=s.get("text") or "")
+                for s in raw_segments
+            ]
+
+        return Transcript.model_construct(
+            text=text,
+            language=lang,
+            segments=segments or None,
+            source_path=source_path,
+        )
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Protocol
+
+import numpy as np
+
+from app.models.summary import MeetingSummary
+from app.services.openai_client import get_openai_client
+
+logger = logging.getLogger(__name__)
+
+# Modelo de embedding barato; o texto é truncado para limitar custo/latência
+_EMBEDDING_MODEL = "text-embedding-3-small"
+_EMBED_TEXT_LIMIT = 8000
+
+# Similaridade de cosseno mínima para considerar dois transcripts equivalentes
+SIMILARITY_THRESHOLD = 0.97
+
+# Só vale cachear chamadas (quase) determinísticas
+MAX_CACHEABLE_TEMPERATURE = 0.2
+
+
+class CacheBackend(Protocol):
+    """Armazenamento chave-valor para os resumos serializados."""
+
+    def get(self, key: str) -> str | None: ...
+
+    def set(self, key: str, value: str) -> None: ...
+
+
+class MemoryBackend:
+    """Backend em memória (por processo); padrão para a sessão web/CLI."""
+
+    def __init__(self) -> None:
+        self._data: dict[str, str] = {}
+
+    def get(self, key: str) -> str | None:
+        return self._data.get(key)
+
+    def set(self, key: str, value: str) -> None:
+        self._data[key] = value
+
+
+class FileBackend:
+    """Backend em disco: um arquivo JSON por chave, sobrevive a reinícios."""
+
+    def __init__(self, cache_dir: Path | None = None) -> None:
+        self._dir = cache_dir or Path.home() / ".cache" / "clareia" / "summaries"
+
+    def get(self, key: str) -> str | None:
+        path = self._dir / f"{key}.json"
+        try:
+            return path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        self._dir.mkdir(parents=True, exist_ok=True)
+        tmp = self._dir / f"{key}.json.tmp"
+        tmp.write_text(value, encoding="utf-8")
+        tmp.replace(self._dir / f"{key}.json")
+
+
+def exact_key(model: str, temperature: float, system_prompt: str, user_prompt: str) -> str:
+    """Chave determinística sobre tudo que influencia a resposta do modelo."""
+    payload = json.dumps(
+        {"model": model, "t": temperature, "sys": system_prompt, "usr": user_prompt},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class SummaryCache:
+    """Cache de resumos com lookup exato (hash) e semântico (embedding).
+
+    Hit exato não gasta nada; no miss, o transcript é embedado uma vez e
+    comparado por cosseno contra os embeddings já vistos — transcripts
+    repetidos ou quase idênticos reaproveitam o MeetingSummary armazenado
+    sem pagar o round-trip do modelo de chat.
+    """
+
+    def __init__(self, backend: CacheBackend | None = None, threshold: float = SIMILARITY_THRESHOLD) -> None:
+        self._backend = backend if backend is not None else MemoryBackend()
+        self._threshold = threshold
+        # Matriz (N, dim) de embeddings L2-normalizados e as chaves correspondentes
+        self._matrix: np.ndarray | None = None
+        self._keys: list[str] = []
+        # Embedding do último miss, reaproveitado pelo put da mesma chave para
+        # não pagar duas chamadas de embedding por resumo não cacheado
+        self._pending: tuple[str, np.ndarray] | None = None
+
+    def _embed(self, text: str) -> np.ndarray | None:
+        """Embeda o texto (truncado); None se a chamada falhar."""
+        try:
+            client = get_openai_client()
+            response = client.embeddings.create(model=_EMBEDDING_MODEL, input=text[:_EMBED_TEXT_LIMIT])
+            vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+        except Exception:
+            logger.exception("Falha ao gerar embedding para o cache semântico")
+            return None
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    def _semantic_lookup(self, embedding: np.ndarray) -> str | None:
+        """Retorna a chave do vizinho mais próximo acima do threshold, se houver."""
+        if self._matrix is None or not len(self._keys):
+            return None
+        # Vetores normalizados: produto escalar == similaridade de cosseno
+        scores = self._matrix @ embedding
+        best = int(np.argmax(scores))
+        if float(scores[best]) >= self._threshold:
+            return self._keys[best]
+        return None
+
+    def get(self, key: str, text: str) -> MeetingSummary | None:
+        """Busca um resumo: hit exato primeiro (sem embedding), semântico depois."""
+        cached = self._backend.get(key)
+        if cached is None:
+            embedding = self._embed(text)
+            if embedding is None:
+                return None
+            self._pending = (key, embedding)
+            near_key = self._semantic_lookup(embedding)
+            if near_key is None:
+                return None
+            cached = self._backend.get(near_key)
+            if cached is None:
+                return None
+            logger.info("Cache semântico: hit por similaridade")
+        else:
+            logger.info("Cache de resumos: hit exato")
+
+        try:
+            return MeetingSummary.model_validate_json(cached)
+        except Exception:
+            logger.exception("Entrada de cache inválida; ignorando")
+            return None
+
+    def put(self, key: str, text: str, summary: MeetingSummary) -> None:
+        """Armazena o resumo e registra o embedding do transcript para lookups futuros."""
+        self._backend.set(key, summary.model_dump_json())
+
+        if self._pending is not None and self._pending[0] == key:
+            embedding = self._pending[1]
+            self._pending = None
+        else:
+            embedding = self._embed(text)
+        if embedding is None:
+            return
+        row = embedding[np.newaxis, :]
+        self._matrix = row if self._matrix is None else np.vstack((self._matrix, row))
+        self._keys.append(key)
@@ -6,11 +6,16 @@ Interface web intuitiva para transcrição e sumarização de áudios com OpenAI
 from __future__ import annotations
 
 import contextlib
+import hashlib
+import html
 import json
+import shutil
 import sys
 import tempfile
+import time
 from datetime import UTC, datetime
 from pathlib import Path
+from types import MappingProxyType
 from typing import TYPE_CHECKING
 
 # Adiciona o diretório pai ao path para permitir imports do app
@@ -20,26 +25,30 @@ if str(parent_dir) not in sys.path:
     sys.path.insert(0, str(parent_dir))
 
 import streamlit as st  # noqa: E402
+import streamlit.components.v1 as components  # noqa: E402
+
+# orjson (SIMD) é bem mais rápido que o json da stdlib; opcional, com fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 if TYPE_CHECKING:
     from models.summary import MeetingSummary
     from models.transcript import Transcript
     from streamlit.runtime.uploaded_file_manager import UploadedFile
 
-# Importações do ClareIA
+# Importações do ClareIA (só o necessário para pintar a página; os módulos
+# core, que puxam o SDK da OpenAI, são importados sob demanda nos handlers)
 try:
     from app import __version__
     from app.core.config import get_settings
-    from app.core.summarizer import summarize_transcript
-    from app.core.transcriber import transcribe_file
 
     APP_VERSION = __version__
 except ImportError:
     # Fallback para quando executado diretamente
     import __init__ as app_init
     from core.config import get_settings
-    from core.summarizer import summarize_transcript
-    from core.transcriber import transcribe_file
 
     APP_VERSION = getattr(app_init, "__version__", "0.1.0")
 
@@ -55,9 +64,11 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# CSS customizado
-st.markdown(
-    """
+# CSS customizado (constante de módulo: um único objeto string por processo).
+# Precisa ser reemitido a cada rerun — o Streamlit remove do frontend qualquer
+# elemento que o script não regenerar, então um guard por sessão apagaria o
+# <style> na primeira interação
+_CSS = """
     <style>
     .stApp {
         max-width: 1400px;
@@ -99,9 +110,9 @@ st.markdown(
         padding-right: 20px;
     }
     </style>
-    """,
-    unsafe_allow_html=True,
-)
+    """
+
+st.markdown(_CSS, unsafe_allow_html=True)
 
 
 def check_api_key() -> bool:
@@ -128,26 +139,343 @@ def save_uploaded_file(uploaded_file: UploadedFile) -> Path:
     file_ext = Path(uploaded_file.name).suffix
     temp_path = temp_dir / f"audio_{timestamp}{file_ext}"
 
+    # Streaming em blocos de 1 MB: getbuffer() materializaria o upload inteiro
+    # em memória antes da escrita, dobrando o pico de RSS para arquivos grandes
+    uploaded_file.seek(0)
     with temp_path.open("wb") as f:
-        f.write(uploaded_file.getbuffer())
+        shutil.copyfileobj(uploaded_file, f, length=1024 * 1024)
 
     return temp_path
 
 
+# Player sincronizado (mapping imutável: construído uma vez no import)
+_AUDIO_MIMES = MappingProxyType(
+    {
+        ".mp3": "audio/mpeg",
+        ".wav": "audio/wav",
+        ".m4a": "audio/mp4",
+        ".ogg": "audio/ogg",
+        ".webm": "audio/webm",
+    }
+)
+PLAYER_HEIGHT = 600
+
+
+def _json_dumps_str(obj: object) -> str:
+    """Serializa para JSON compacto, preferindo orjson quando disponível."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def _json_dumps_indent(obj: object) -> bytes:
+    """Serializa com indentação para download, preferindo orjson.
+
+    st.download_button aceita bytes direto, então não há decode no caminho.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode()
+
+
+# Reruns do Streamlit re-executam display_* a cada interação de widget; o
+# render de Markdown é memoizado por uma chave de conteúdo, com o payload
+# fora do hash do Streamlit (prefixo _)
+
+
+def _summary_cache_key(summary: MeetingSummary) -> str:
+    """Chave de cache estável por conteúdo.
+
+    st.cache_data é global e de vida longa; id() é reciclado pelo GC e podia
+    servir o resultado de outro resumo. model_dump_json sai do serializador
+    Rust do pydantic-core, então o hash custa pouco mesmo por rerun.
+    """
+    return hashlib.blake2b(summary.model_dump_json().encode(), digest_size=16).hexdigest()
+
+
+@st.cache_data(show_spinner=False)
+def _cached_markdown(cache_key: str, _summary: MeetingSummary) -> str:  # noqa: ARG001
+    return _summary.to_markdown()
+
+
+@st.cache_data(show_spinner=False)
+def _cached_transcript_json(cache_key: str, _transcript: Transcript) -> bytes:  # noqa: ARG001
+    # model_dump_json serializa direto no pydantic-core, sem o dict
+    # intermediário de model_dump() sobre todos os segmentos
+    return _transcript.model_dump_json(indent=2).encode()
+
+
+@st.cache_data(show_spinner=False)
+def _cached_summary_json(cache_key: str, _summary: MeetingSummary) -> bytes:  # noqa: ARG001
+    return _json_dumps_indent(_summary.model_dump())
+
+
+# Diretório servido pelo static serving do Streamlit (server.enableStaticServing)
+_STATIC_DIR = Path(__file__).parent / "static"
+
+
+def _static_audio_url(path: str, _mtime_ns: int) -> str:
+    """Publica o áudio uma única vez em static/ e retorna a URL servida.
+
+    Servir por URL em vez de data-URI corta a taxa de ~33% do base64, manda um
+    HTML pequeno por rerun e deixa o navegador fazer range requests ao buscar
+    um trecho do áudio (seek em O(1), sem decodificar o payload inteiro).
+    """
+    path_obj = Path(path)
+    digest = hashlib.blake2b(f"{path_obj}|{_mtime_ns}".encode(), digest_size=8).hexdigest()
+    target = _STATIC_DIR / f"{digest}{path_obj.suffix.lower()}"
+
+    # Uma cópia publicada por sessão: remove a anterior ao trocar de áudio,
+    # senão static/ acumula uma cópia por upload (os temps têm nome único)
+    previous = st.session_state.get("static_audio_path")
+    if previous is not None and Path(previous) != target:
+        with contextlib.suppress(OSError):
+            Path(previous).unlink(missing_ok=True)
+    st.session_state["static_audio_path"] = target
+
+    if not target.exists():
+        _STATIC_DIR.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(path_obj, target)
+
+    return f"/app/static/{target.name}"
+
+
+# Template de um segmento; texto escapado e timestamp formatado já vão prontos
+# no HTML estático, então o JS não precisa reconstruir nada por montagem
+_SEG_TMPL = '<div class="segment" id="seg-{i}"><span class="seg-time">{time}</span>{text}</div>'
+
+
+def _fmt_time(seconds: float) -> str:
+    """Formata segundos como MM:SS para o rótulo do segmento."""
+    minutes, secs = divmod(int(seconds), SECONDS_PER_MINUTE)
+    return f"{minutes:02d}:{secs:02d}"
+
+
+# Partes estáticas do HTML do player, construídas uma vez no import. Só as
+# fatias dinâmicas (URL, MIME, segmentos e arrays de tempos) entram no join —
+# o CSS/JS (~90% dos bytes) não é re-materializado por chamada
+_PLAYER_HEAD = """
+    <style>
+    .player-wrap {
+        font-family: "Source Sans Pro", sans-serif;
+    }
+    .player-wrap audio {
+        width: 100%;
+        margin-bottom: 0.75rem;
+    }
+    #transcriptContainer {
+        position: relative;
+        max-height: 420px;
+        overflow-y: auto;
+        border: 1px solid #e0e0e0;
+        border-radius: 0.5rem;
+        padding: 0.5rem;
+    }
+    .segment {
+        padding: 0.4rem 0.6rem;
+        margin: 0.15rem 0;
+        border-radius: 0.4rem;
+        cursor: pointer;
+        transition: background-color 0.15s;
+    }
+    .segment:hover {
+        background-color: #f0f2f6;
+    }
+    .segment.played {
+        color: #808495;
+    }
+    .segment.active {
+        background-color: #fff3cd;
+        border-left: 3px solid #ffc107;
+    }
+    .seg-time {
+        color: #808495;
+        font-size: 0.8em;
+        margin-right: 0.5rem;
+    }
+    </style>
+    <div class="player-wrap">
+        <audio id="syncAudio" controls preload="metadata">
+            <source src=\""""
+
+_PLAYER_MID = """">
+        </audio>
+        <div id="transcriptContainer">"""
+
+_PLAYER_SCRIPT_HEAD = """</div>
+    </div>
+    <script>
+    const audio = document.getElementById('syncAudio');
+    const container = document.getElementById('transcriptContainer');
+    const nodes = Array.from(container.children);
+    const starts = Float64Array.from("""
+
+_PLAYER_SCRIPT_TAIL = """);
+
+    let activeIdx = -1;
+    let playedUpTo = -1;
+    let framePending = false;
+
+    // Maior índice i com starts[i] <= value, via busca binária (O(log N))
+    function lowerBound(arr, value) {
+        let lo = 0, hi = arr.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (arr[mid] <= value) lo = mid + 1; else hi = mid;
+        }
+        return lo;
+    }
+
+    function updateActiveSegment(currentTime) {
+        const idx = lowerBound(starts, currentTime) - 1;
+        const active = (idx >= 0 && currentTime < ends[idx]) ? idx : -1;
+
+        // Só toca nos dois nós que mudam, não em todos os N segmentos
+        if (active !== activeIdx) {
+            if (activeIdx >= 0) nodes[activeIdx].classList.remove('active');
+            if (active >= 0) {
+                nodes[active].classList.add('active');
+                // scrollTop direto: o smooth-scroll nativo re-dispara layout a
+                // cada frame da animação enquanto o áudio continua tocando
+                const node = nodes[active];
+                container.scrollTop = node.offsetTop - (container.clientHeight - node.offsetHeight) / 2;
+            }
+            activeIdx = active;
+        }
+
+        // 'played' avança (ou retrocede, após seek) só sobre o intervalo que mudou
+        const done = Math.max(active >= 0 ? active - 1 : idx, -1);
+        for (let i = playedUpTo + 1; i <= done; i++) nodes[i].classList.add('played');
+        for (let i = playedUpTo; i > done; i--) nodes[i].classList.remove('played');
+        playedUpTo = done;
+    }
+
+    container.addEventListener('click', (ev) => {
+        const seg = ev.target.closest('.segment');
+        if (!seg) return;
+        // Índice do nó em vez de re-parsear data-attributes como string
+        const i = nodes.indexOf(seg);
+        if (i >= 0) {
+            audio.currentTime = starts[i];
+            audio.play();
+            // Atualiza já no clique, sem esperar o próximo timeupdate
+            updateActiveSegment(starts[i]);
+        }
+    });
+
+    // Coalesce updates: no máximo um por frame, mesmo com timeupdate mais frequente
+    audio.addEventListener('timeupdate', () => {
+        if (framePending) return;
+        framePending = true;
+        requestAnimationFrame(() => {
+            framePending = false;
+            updateActiveSegment(audio.currentTime);
+        });
+    });
+    </script>
+    """
+
+
+@st.cache_data(show_spinner=False)
+def _player_html(path: str, _mtime_ns: int, segments: tuple[tuple[float, float, str], ...]) -> str:
+    """Monta o HTML completo do player (áudio via URL estática + segmentos pré-renderizados).
+
+    O resultado é memoizado por (path, mtime, segmentos): reruns do Streamlit
+    reutilizam a string inteira sem re-renderizar os segmentos.
+    """
+    audio_url = _static_audio_url(path, _mtime_ns)
+    audio_mime = _AUDIO_MIMES.get(Path(path).suffix.lower(), "audio/mpeg")
+
+    segments_html = "".join(
+        _SEG_TMPL.format(i=i, time=_fmt_time(start), text=html.escape(text, quote=False))
+        for i, (start, _end, text) in enumerate(segments)
+    )
+    # Só os tempos vão para o JS; texto e ids já estão no DOM. Layout SoA
+    # (duas listas paralelas) em vez de N dicts: o payload não repete chaves
+    starts_json = _json_dumps_str([start for start, _end, _text in segments])
+    ends_json = _json_dumps_str([end for _start, end, _text in segments])
+
+    return "".join(
+        (
+            _PLAYER_HEAD,
+            audio_url,
+            '" type="',
+            audio_mime,
+            _PLAYER_MID,
+            segments_html,
+            _PLAYER_SCRIPT_HEAD,
+            starts_json,
+            ");\n    const ends = Float64Array.from(",
+            ends_json,
+            _PLAYER_SCRIPT_TAIL,
+        )
+    )
+
+
+def create_synchronized_player(audio_path: str, transcript: Transcript, height: int = PLAYER_HEIGHT) -> None:
+    """Renderiza um player de áudio com o transcript sincronizado por timestamps.
+
+    O segmento ativo é destacado conforme o áudio toca e clicar em um segmento
+    posiciona o player no instante correspondente.
+    """
+    # Validações baratas primeiro; a publicação do áudio e a montagem do HTML
+    # (o trabalho caro) só acontecem depois que tudo foi checado
+    segments = transcript.segments or []
+    if not segments:
+        st.warning("⚠️ Transcrição sem timestamps: o player sincronizado precisa de segmentos.")
+        return
+
+    path_obj = Path(audio_path)
+    if not path_obj.is_file():
+        st.warning("⚠️ Áudio original não encontrado para o player sincronizado.")
+        return
+
+    seg_key = tuple((seg.start or 0.0, seg.end or 0.0, seg.text) for seg in segments)
+    mtime_ns = path_obj.stat().st_mtime_ns
+
+    # Memoiza o HTML final na sessão: reruns posteriores nem re-hasheiam os
+    # segmentos no st.cache_data. blake2b é mais rápido que sha256 para chaves
+    cache_key = hashlib.blake2b(f"{path_obj}|{mtime_ns}|{hash(seg_key)}".encode(), digest_size=16).hexdigest()
+    state_key = f"player_html_{cache_key}"
+    player_html = st.session_state.get(state_key)
+    if player_html is None:
+        player_html = _player_html(str(path_obj), mtime_ns, seg_key)
+        st.session_state[state_key] = player_html
+
+    components.html(player_html, height=height, scrolling=True)
+
+
 def display_transcript(transcript: Transcript, key_suffix: str = "") -> None:
     """Exibe a transcrição de forma formatada."""
+    text = transcript.text
+    source_path = transcript.source_path
+
+    # Player sincronizado, quando há timestamps e o áudio original ainda existe
+    if transcript.segments and source_path and Path(source_path).is_file():
+        with st.expander("🎧 **Player Sincronizado**", expanded=False):
+            create_synchronized_player(source_path, transcript)
+
     with st.expander("📝 **Transcrição Completa**", expanded=True):
+        # Contagens O(N) feitas uma vez por transcrição (não a cada rerun);
+        # o guard compara um hash do conteúdo — comprimento igual não implica
+        # texto igual — e cobre transcrições que não passaram pelo handler
+        text_hash = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+        if st.session_state.get("transcript_text_hash") != text_hash:
+            st.session_state["transcript_text_hash"] = text_hash
+            st.session_state["transcript_char_count"] = len(text)
+            st.session_state["transcript_word_count"] = len(text.split())
+
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Caracteres", f"{len(transcript.text):,}")
+            st.metric("Caracteres", f"{st.session_state['transcript_char_count']:,}")
         with col2:
-            st.metric("Palavras", f"{len(transcript.text.split()):,}")
+            st.metric("Palavras", f"{st.session_state['transcript_word_count']:,}")
         with col3:
             st.metric("Idioma", transcript.language.upper())
 
         st.text_area(
             "Conteúdo",
-            transcript.text,
+            text,
             height=300,
             disabled=False,
             key=f"transcript_text_{key_suffix}",
@@ -159,8 +487,13 @@ def display_transcript(transcript: Transcript, key_suffix: str = "") -> None:
             st.info("💡 Use Ctrl+A para selecionar todo o texto")
 
         with col2:
-            transcript_json = json.dumps(transcript.model_dump(), ensure_ascii=False, indent=2)
-            timestamp = datetime.now(tz=UTC).strftime("%Y%m%d_%H%M%S")
+            # Bytes memoizados: o download_button do Streamlit 1.48 só aceita
+            # payload materializado, então a serialização fica no st.cache_data
+            # keyado por conteúdo (o hash já foi calculado para as métricas)
+            transcript_json = _cached_transcript_json(f"{text_hash}_{len(transcript.segments or ())}", transcript)
+
+            # Timestamp fixado na transcrição, não reformatado a cada rerun
+            timestamp = st.session_state.get("transcript_ts") or datetime.now(tz=UTC).strftime("%Y%m%d_%H%M%S")
             st.download_button(
                 label="💾 Baixar JSON",
                 data=transcript_json,
@@ -210,10 +543,12 @@ def display_summary(summary: MeetingSummary, key_suffix: str = "") -> None:
         st.divider()
         col1, col2 = st.columns(2)
 
-        timestamp = datetime.now(tz=UTC).strftime("%Y%m%d_%H%M%S")
+        timestamp = st.session_state.get("summary_ts") or datetime.now(tz=UTC).strftime("%Y%m%d_%H%M%S")
+
+        summary_key = _summary_cache_key(summary)
 
         with col1:
-            summary_json = json.dumps(summary.model_dump(), ensure_ascii=False, indent=2)
+            summary_json = _cached_summary_json(summary_key, summary)
             st.download_button(
                 label="💾 Baixar Ata (JSON)",
                 data=summary_json,
@@ -223,10 +558,7 @@ def display_summary(summary: MeetingSummary, key_suffix: str = "") -> None:
             )
 
         with col2:
-            try:
-                markdown_content = summary.to_markdown()
-            except AttributeError:
-                markdown_content = _create_markdown_from_summary(summary)
+            markdown_content = _cached_markdown(summary_key, summary)
 
             st.download_button(
                 label="📄 Baixar Ata (Markdown)",
@@ -237,34 +569,27 @@ def display_summary(summary: MeetingSummary, key_suffix: str = "") -> None:
             )
 
 
-def _create_markdown_from_summary(summary: MeetingSummary) -> str:
-    """Cria markdown a partir do resumo."""
-    return f"""# {summary.title or "Ata da Reunião"}
-
-## Resumo
-{summary.summary}
-
-## Pontos Principais
-{chr(10).join("- " + p for p in summary.key_points)}
-
-## Decisões
-{chr(10).join("- " + d for d in summary.decisions)}
-
-## Ações
-{chr(10).join("- " + a.description for a in summary.action_items)}
-
-## Insights
-{chr(10).join("- " + i for i in summary.insights)}
-"""
-
-
 def _handle_transcription(uploaded_file: UploadedFile, config: dict) -> None:
     """Processa a transcrição do arquivo."""
+    try:
+        from app.core.transcriber import transcribe_file  # noqa: PLC0415
+    except ImportError:
+        from core.transcriber import transcribe_file  # noqa: PLC0415
+
     with st.spinner("Transcrevendo áudio... Isso pode levar alguns minutos."):
         try:
+            # Um áudio por sessão: remove o anterior antes de gravar o novo,
+            # senão clareia_uploads/ acumula um arquivo por transcrição
+            old_audio = st.session_state.get("audio_path")
+            if old_audio is not None:
+                with contextlib.suppress(OSError):
+                    Path(old_audio).unlink(missing_ok=True)
+
             temp_path = save_uploaded_file(uploaded_file)
+            st.session_state["audio_path"] = temp_path
 
-            start_time = datetime.now(tz=UTC)
+            # perf_counter: relógio monotônico, imune a ajustes do relógio de parede
+            start_time = time.perf_counter()
             transcript = transcribe_file(
                 str(temp_path),
                 model=config["model"],
@@ -272,13 +597,22 @@ def _handle_transcription(uploaded_file: UploadedFile, config: dict) -> None:
                 response_format=config["format"],
                 prompt=config.get("prompt"),
             )
-            processing_time = (datetime.now(tz=UTC) - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_time
 
             st.session_state["transcript"] = transcript
             st.session_state["processing_time"] = processing_time
-
-            with contextlib.suppress(Exception):
-                temp_path.unlink(missing_ok=True)
+            st.session_state["transcript_ts"] = datetime.now(tz=UTC).strftime("%Y%m%d_%H%M%S")
+            # Métricas pré-computadas: evita re-escanear o texto a cada rerun
+            st.session_state["transcript_text_hash"] = hashlib.blake2b(
+                transcript.text.encode(), digest_size=16
+            ).hexdigest()
+            st.session_state["transcript_char_count"] = len(transcript.text)
+            st.session_state["transcript_word_count"] = len(transcript.text.split())
+
+            # Mantém o áudio no disco quando há segmentos: o player sincronizado precisa dele
+            if not transcript.segments:
+                with contextlib.suppress(Exception):
+                    temp_path.unlink(missing_ok=True)
 
             st.success(f"✅ Transcrição concluída em {format_time_duration(processing_time)}!")
             display_transcript(transcript, key_suffix="tab1_new")
@@ -291,19 +625,25 @@ def _handle_transcription(uploaded_file: UploadedFile, config: dict) -> None:
 
 def _handle_summary_generation(transcript: Transcript, config: dict) -> None:
     """Gera o resumo da transcrição."""
+    try:
+        from app.core.summarizer import summarize_transcript  # noqa: PLC0415
+    except ImportError:
+        from core.summarizer import summarize_transcript  # noqa: PLC0415
+
     with st.spinner("Analisando transcrição e gerando insights..."):
         try:
-            start_time = datetime.now(tz=UTC)
+            start_time = time.perf_counter()
             summary = summarize_transcript(
                 transcript,
                 model=config["model"],
                 temperature=config["temperature"],
                 extra_context=config.get("context"),
             )
-            processing_time = (datetime.now(tz=UTC) - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_time
 
             st.session_state["summary"] = summary
             st.session_state["summary_time"] = processing_time
+            st.session_state["summary_ts"] = datetime.now(tz=UTC).strftime("%Y%m%d_%H%M%S")
 
             st.success(f"✅ Ata gerada em {format_time_duration(processing_time)}!")
             display_summary(summary, key_suffix="tab2_new")
@@ -431,7 +771,25 @@ def _setup_sidebar() -> dict:
         st.divider()
 
         if st.button("🗑️ Limpar Sessão", key="clear_session"):
-            for key in ["transcript", "summary", "processing_time", "summary_time"]:
+            for path_key in ["audio_path", "static_audio_path"]:
+                old_audio = st.session_state.get(path_key)
+                if old_audio is not None:
+                    with contextlib.suppress(OSError):
+                        Path(old_audio).unlink(missing_ok=True)
+            for key in [
+                "transcript",
+                "summary",
+                "processing_time",
+                "summary_time",
+                "follow_up_email",
+                "transcript_char_count",
+                "transcript_word_count",
+                "transcript_text_hash",
+                "transcript_ts",
+                "summary_ts",
+                "audio_path",
+                "static_audio_path",
+            ]:
                 if key in st.session_state:
                     del st.session_state[key]
             st.success("Sessão limpa!")
@@ -526,6 +884,68 @@ def _show_summary_tab(config: dict) -> None:
         st.info("📄 Última ata gerada:")
         display_summary(st.session_state["summary"], key_suffix="tab2_existing")
 
+        st.divider()
+        _show_follow_up_email_section(config)
+
+
+def _show_follow_up_email_section(config: dict) -> None:
+    """Mostra a seção de geração de e-mail de follow-up."""
+    st.markdown("### 📧 E-mail de Follow-up")
+
+    recipient = st.text_input(
+        "Destinatário (opcional)",
+        placeholder="Ex: time de produto",
+        key="email_recipient",
+    )
+
+    if st.button("✉️ Gerar E-mail de Follow-up", key="generate_email"):
+        try:
+            from app.core.email_generator import parse_follow_up_email, stream_follow_up_email  # noqa: PLC0415
+        except ImportError:
+            from core.email_generator import parse_follow_up_email, stream_follow_up_email  # noqa: PLC0415
+
+        try:
+            # A resposta chega por streaming: o usuário vê o texto sendo
+            # escrito em vez de esperar a latência total do modelo
+            with st.expander("✍️ Redigindo e-mail...", expanded=True):
+                content = st.write_stream(
+                    stream_follow_up_email(
+                        st.session_state["summary"],
+                        model=config["summary_model"],
+                        temperature=config["temperature"],
+                        recipient_name=recipient or None,
+                        extra_context=config.get("extra_context") or None,
+                    )
+                )
+            email = parse_follow_up_email(str(content), st.session_state["summary"])
+            st.session_state["follow_up_email"] = email
+        except Exception as e:
+            st.error(f"❌ Erro ao gerar e-mail: {e!s}")
+
+    email = st.session_state.get("follow_up_email")
+    if email:
+        st.text_input("Assunto", email.subject, key="email_subject_view")
+        st.text_area("Conteúdo", email.to_plain_text(), height=250, key="email_body_view")
+
+        timestamp = datetime.now(tz=UTC).strftime("%Y%m%d_%H%M%S")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                label="💾 Baixar E-mail (TXT)",
+                data=email.to_plain_text(),
+                file_name=f"email_{timestamp}.txt",
+                mime="text/plain",
+                key="download_email_txt",
+            )
+        with col2:
+            st.download_button(
+                label="🌐 Baixar E-mail (HTML)",
+                data=email.to_html(),
+                file_name=f"email_{timestamp}.html",
+                mime="text/html",
+                key="download_email_html",
+            )
+
 
 def _show_help_tab() -> None:
     """Mostra a tab de ajuda."""
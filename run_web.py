@@ -18,6 +18,7 @@ def main() -> int:
         str(web_app),
         "--server.port=8501",
         "--server.address=localhost",
+        "--server.enableStaticServing=true",
         "--browser.gatherUsageStats=false",
     ]
 